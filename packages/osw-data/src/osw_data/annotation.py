@@ -142,10 +142,12 @@ class AnnotationSystem:
     ) -> TrajectoryAnnotations:
         """Get all annotations for a specific trajectory"""
         annotation_path = self._get_trajectory_annotation_path(instance_id, agent_id)
-        if annotation_path.exists():
+        # Open directly instead of probing with exists() first
+        try:
             with open(annotation_path, "r") as f:
                 return TrajectoryAnnotations.model_validate_json(f.read())
-        return TrajectoryAnnotations(instance_id=instance_id, agent_id=agent_id)
+        except FileNotFoundError:
+            return TrajectoryAnnotations(instance_id=instance_id, agent_id=agent_id)
 
     def add_annotation(
         self,
@@ -168,11 +168,14 @@ class MultiAgentDataset:
     def get_instance_metadata(self, instance_id: str) -> DataInstance:
         """Get metadata for a specific instance"""
         instance_path = self.instances_path / instance_id
-        if not instance_path.exists():
-            raise ValueError(f"Instance {instance_id} does not exist")
-
-        with open(instance_path / "metadata.json", "r") as f:
-            return DataInstance.model_validate_json(f.read())
+        # Open directly and only stat the instance directory on failure
+        try:
+            with open(instance_path / "metadata.json", "r") as f:
+                return DataInstance.model_validate_json(f.read())
+        except FileNotFoundError:
+            if not instance_path.exists():
+                raise ValueError(f"Instance {instance_id} does not exist") from None
+            raise
 
     def update_instance_metadata(
         self, instance_id: str, new_meta: dict[str, Any]
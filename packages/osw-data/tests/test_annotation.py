@@ -62,3 +62,16 @@ def test_annotation_system() -> None:
         span=AnnotationSpan(start_time=datetime.now(), end_time=datetime.now()),
         confidence=0.85,
     )
+
+
+def test_get_unannotated_trajectory(tmp_path: Path) -> None:
+    annotation_system = AnnotationSystem(
+        base_path=tmp_path, project_name="Empty Project"
+    )
+
+    trajectory_annotations = annotation_system.get_trajectory_annotations(
+        instance_id="instance_001", agent_id="robot_1"
+    )
+    assert trajectory_annotations.instance_id == "instance_001"
+    assert trajectory_annotations.agent_id == "robot_1"
+    assert trajectory_annotations.annotations == []
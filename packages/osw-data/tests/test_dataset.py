@@ -1,3 +1,4 @@
+import pytest
 from osw_data import MultiAgentDataset, AgentMetadata, MediaType, PointType
 from datetime import datetime
 import numpy as np
@@ -65,3 +66,25 @@ def test_dataset() -> None:
 
     # Close the dataset
     dataset.close()
+
+
+def test_get_instance_metadata(tmp_path: Path) -> None:
+    dataset = MultiAgentDataset(name="Metadata Dataset", base_path=tmp_path)
+    instance_id = dataset.create_instance(
+        agents_metadata={
+            "robot_1": AgentMetadata(agent_id="robot_1", agent_type="manipulator")
+        },
+        instance_metadata={"scenario": "pick_and_place"},
+    )
+
+    instance = dataset.get_instance_metadata(instance_id)
+    assert instance.instance_id == instance_id
+    assert instance.metadata == {"scenario": "pick_and_place"}
+
+    with pytest.raises(ValueError, match="Instance missing does not exist"):
+        dataset.get_instance_metadata("missing")
+
+    # An instance directory without metadata surfaces the underlying error
+    (tmp_path / "instances" / "no_metadata").mkdir()
+    with pytest.raises(FileNotFoundError):
+        dataset.get_instance_metadata("no_metadata")
@@ -8,13 +8,102 @@ from rich.table import Table
 import json
 
 from osw_data.annotation import AnnotationSystem, AnnotationSpan
-from osw_data.dataset import MultiAgentDataset
-from osw_data.trajectory import PointType, MediaType
+from osw_data.dataset import DataInstance, MultiAgentDataset
+from osw_data.trajectory import PointType, MediaType, SymmetricTrajectory
+
+from tty_utils import format_accessibility_tree
 
 console = Console()
 app = typer.Typer()
 
 
+def _clean_json_obs(json_str: str) -> tuple[str, str]:
+    # Remove the outer curly brackets
+    content = json_str.strip("{}")
+    # Remove the "content": part at the beginning
+    if '"content": ' in content:
+        content = content.split('"content": ', 1)[1]
+    # Remove the quotes at the start and end
+    content = content.strip('"')
+    # Replace escaped newlines with actual newlines
+    content = content.replace("\\n", "\n")
+    # Replace escaped quotes with regular quotes
+    content = content.replace('\\"', '"')
+    if "Turn #" in content:
+        content = content.split(":", 1)[1].strip()
+    content = content.strip('" ')
+
+    # Format the content with proper line breaks
+    console_lines: list[str] = []
+    st_lines: list[str] = []
+
+    # Split content into lines and process each line
+    content_lines = content.split("\n")
+    for line in content_lines:
+        # Skip empty lines and standalone quotes
+        if line.strip() in ["", '"']:
+            continue
+
+        if ":" in line:
+            label, rest = line.split(":", 1)
+            if label.strip():
+                console_line = f"[bold green]{label}[/bold green]:{rest}"
+                st_line = f"**{label}**:{rest}"
+            else:
+                console_line = line
+                st_line = line
+        else:
+            console_line = line
+            st_line = line
+
+        console_lines.append(console_line)
+        st_lines.append(st_line)
+
+    console_output = "\n".join(console_lines)
+    st_output = "\n\n".join(st_lines)
+    return (console_output, st_output)
+
+
+def _clean_json_action(json_str: str, agent_name: str = "") -> str:
+    # Remove the outer curly brackets
+    content = json_str.strip("{}")
+    # Remove the "content": part at the beginning
+    if '"content": ' in content:
+        content = content.split('"content": ', 1)[1]
+    # Remove the quotes at the start and end
+    content = content.strip('"')
+
+    # Clean up any weird spacing or single-character lines
+    lines = []
+    for line in content.split("\\n"):
+        # Skip single character lines
+        if len(line.strip()) <= 1:
+            continue
+        # Remove any excessive spaces
+        line = " ".join(line.split())
+        lines.append(line)
+    content = " ".join(lines)
+
+    # Replace escaped quotes with regular quotes
+    content = content.replace("\\'", "'")
+    content = content.replace('\\"', '"')
+
+    # Add agent name prefix if provided
+    if agent_name:
+        content = f"{agent_name}: {content}"
+
+    # Remove Rich formatting tags
+    content = content.replace("[bold green]", "").replace("[/bold green]", "")
+    content = content.replace("[bold]", "").replace("[/bold]", "")
+    content = content.replace("[dim]", "").replace("[/dim]", "")
+
+    # Clean up any remaining special characters or weird spacing
+    content = content.replace("′", "'")  # Replace special quotes
+    content = content.replace("  ", " ")  # Remove double spaces
+
+    return content
+
+
 class TTYAnnotator:
     """TTY-based annotation interface using Rich"""
 
@@ -26,11 +115,26 @@ class TTYAnnotator:
         use_streamlit: bool = False,
     ):
         self.use_streamlit = use_streamlit
+
+        # Instance metadata is read, and trajectory points sorted, at most once
+        # per session. The dataset already memoizes trajectories, so they only
+        # need a cache of their own when the dataset is rebuilt on each rerun
+        self._metadata_cache: dict[str, DataInstance] = {}
+        self._trajectory_cache: dict[tuple[str, str], SymmetricTrajectory] | None = None
+        self._point_order_cache: dict[tuple[str, str], list[int]] = {}
         if use_streamlit:
             import streamlit as st
 
             self.st = st
 
+            # Streamlit rebuilds the annotator, and with it the dataset, on
+            # every rerun, so keep the caches in session state
+            self._metadata_cache = st.session_state.setdefault("metadata_cache", {})
+            self._trajectory_cache = st.session_state.setdefault("trajectory_cache", {})
+            self._point_order_cache = st.session_state.setdefault(
+                "point_order_cache", {}
+            )
+
         self.dataset = MultiAgentDataset(
             name="dataset",  # This will be loaded from metadata
             base_path=dataset_path,
@@ -57,9 +161,41 @@ class TTYAnnotator:
                 name=annotator_id,  # Using ID as name for simplicity
             )
 
+    def _get_instance_metadata(self, instance_id: str) -> DataInstance:
+        """Get metadata for an instance, loading it from the dataset once"""
+        if instance_id not in self._metadata_cache:
+            self._metadata_cache[instance_id] = self.dataset.get_instance_metadata(
+                instance_id
+            )
+        return self._metadata_cache[instance_id]
+
+    def _get_trajectory(self, instance_id: str, agent_id: str) -> SymmetricTrajectory:
+        """Get an agent's trajectory, reusing the one opened on a previous rerun"""
+        if self._trajectory_cache is None:
+            return self.dataset.get_trajectory(instance_id, agent_id)
+        key = (instance_id, agent_id)
+        if key not in self._trajectory_cache:
+            self._trajectory_cache[key] = self.dataset.get_trajectory(
+                instance_id, agent_id
+            )
+        return self._trajectory_cache[key]
+
+    def _get_point_order(self, instance_id: str, agent_id: str) -> list[int]:
+        """Get the indices of an agent's trajectory points in timestamp order"""
+        key = (instance_id, agent_id)
+        if key not in self._point_order_cache:
+            timestamps = [
+                point.timestamp
+                for point in self._get_trajectory(instance_id, agent_id).points
+            ]
+            self._point_order_cache[key] = sorted(
+                range(len(timestamps)), key=timestamps.__getitem__
+            )
+        return self._point_order_cache[key]
+
     def _select_agent(self, instance_id: str) -> str:
         """Automatically select an unannotated agent for the given instance"""
-        instance = self.dataset.get_instance_metadata(instance_id)
+        instance = self._get_instance_metadata(instance_id)
 
         # Get all agents for this instance
         valid_agents = list(instance.agents.keys())
@@ -92,68 +228,6 @@ class TTYAnnotator:
 
         return selected_agent
 
-    def _format_accessibility_tree(self, html_text: str) -> str:
-        """Format accessibility tree for better readability"""
-        lines = html_text.strip().split("\\n")
-        formatted_lines = []
-
-        for line in lines:
-            if not line.strip():
-                continue
-
-            # Extract indentation level
-            indent_count = 0
-            for char in line:
-                if char == "\\t":
-                    indent_count += 1
-                else:
-                    break
-
-            # Remove tabs from the start
-            line = line.lstrip("\\t")
-
-            # Parse the line
-            if line.startswith("["):
-                # Extract node ID and content
-                node_id = line[1 : line.index("]")]
-                content = line[line.index("]") + 1 :].strip()
-
-                # Format based on content type
-                if "'" in content:
-                    # Extract the quoted text
-                    text = content[content.index("'") + 1 : content.rindex("'")]
-                    attributes = content[content.rindex("'") + 1 :].strip()
-
-                    # Color coding based on element type
-                    if content.startswith("link"):
-                        element = f"[blue]link[/blue] '{text}'"
-                    elif content.startswith("button"):
-                        element = f"[green]button[/green] '{text}'"
-                    elif content.startswith("textbox"):
-                        element = f"[yellow]textbox[/yellow] '{text}'"
-                    elif content.startswith("heading"):
-                        element = f"[magenta]heading[/magenta] '{text}'"
-                    else:
-                        element = f"{content.split(' ')[0]} '{text}'"
-
-                    # Add attributes if present
-                    if attributes:
-                        element += f" [dim]{attributes}[/dim]"
-
-                    formatted_lines.append(
-                        "  " * indent_count + f"[dim]{node_id}:[/dim] {element}"
-                    )
-                else:
-                    # Lines without quoted text
-                    formatted_lines.append(
-                        "  " * indent_count + f"[dim]{node_id}:[/dim] {content}"
-                    )
-            else:
-                # Tab title or other content
-                formatted_lines.append("  " * indent_count + f"[bold]{line}[/bold]")
-
-        return "\n".join(formatted_lines)
-
     def _display_observation(self, data: Any, media_type: MediaType) -> None:
         """Display an observation based on its media type"""
         if media_type == MediaType.JSON:
@@ -170,7 +244,7 @@ class TTYAnnotator:
                         self.st.markdown("#### 🌐 URL")
                         self.st.info(data["url"])
 
-                formatted_html = self._format_accessibility_tree(data["html"])
+                formatted_html = format_accessibility_tree(data["html"])
                 console.print(Panel(formatted_html, title="Page Structure"))
                 if self.use_streamlit:
                     self.st.markdown("#### 📄 Page Structure")
@@ -178,56 +252,7 @@ class TTYAnnotator:
                         self.st.code(formatted_html, language="")
             else:
                 json_str = json.dumps(data, indent=2)
-
-                def clean_json_obs(json_str: str) -> tuple[str, str]:
-                    # Remove the outer curly brackets
-                    content = json_str.strip("{}")
-                    # Remove the "content": part at the beginning
-                    if '"content": ' in content:
-                        content = content.split('"content": ', 1)[1]
-                    # Remove the quotes at the start and end
-                    content = content.strip('"')
-                    # Replace escaped newlines with actual newlines
-                    content = content.replace("\\n", "\n")
-                    # Replace escaped quotes with regular quotes
-                    content = content.replace('\\"', '"')
-                    if "Turn #" in content:
-                        content = content.split(":", 1)[1].strip()
-                    content = content.strip('" ')
-
-                    # Format the content with proper line breaks
-                    console_lines: list[str] = []
-                    st_lines: list[str] = []
-
-                    # Split content into lines and process each line
-                    content_lines = content.split("\n")
-                    for line in content_lines:
-                        # Skip empty lines and standalone quotes
-                        if line.strip() in ["", '"']:
-                            continue
-
-                        if ":" in line:
-                            label, rest = line.split(":", 1)
-                            if label.strip():
-                                console_line = (
-                                    f"[bold green]{label}[/bold green]:{rest}"
-                                )
-                                st_line = f"**{label}**:{rest}"
-                            else:
-                                console_line = line
-                                st_line = line
-                        else:
-                            console_line = line
-                            st_line = line
-
-                        console_lines.append(console_line)
-                        st_lines.append(st_line)
-
-                    console_output = "\n".join(console_lines)
-                    st_output = "\n\n".join(st_lines)
-                    return (console_output, st_output)
-
-                console_output, st_output = clean_json_obs(json_str)
+                console_output, st_output = _clean_json_obs(json_str)
                 width = min(console.width - 2, 120)
 
                 # Console display (with Rich formatting)
@@ -266,49 +291,7 @@ class TTYAnnotator:
         """Display an action"""
         if isinstance(data, dict):
             json_str = json.dumps(data, indent=2)
-
-            def clean_json_action(json_str: str) -> str:
-                # Remove the outer curly brackets
-                content = json_str.strip("{}")
-                # Remove the "content": part at the beginning
-                if '"content": ' in content:
-                    content = content.split('"content": ', 1)[1]
-                # Remove the quotes at the start and end
-                content = content.strip('"')
-
-                # Clean up any weird spacing or single-character lines
-                lines = []
-                for line in content.split("\\n"):
-                    # Skip single character lines
-                    if len(line.strip()) <= 1:
-                        continue
-                    # Remove any excessive spaces
-                    line = " ".join(line.split())
-                    lines.append(line)
-                content = " ".join(lines)
-
-                # Replace escaped quotes with regular quotes
-                content = content.replace("\\'", "'")
-                content = content.replace('\\"', '"')
-
-                # Add agent name prefix if provided
-                if agent_name:
-                    content = f"{agent_name}: {content}"
-
-                # Remove Rich formatting tags
-                content = content.replace("[bold green]", "").replace(
-                    "[/bold green]", ""
-                )
-                content = content.replace("[bold]", "").replace("[/bold]", "")
-                content = content.replace("[dim]", "").replace("[/dim]", "")
-
-                # Clean up any remaining special characters or weird spacing
-                content = content.replace("′", "'")  # Replace special quotes
-                content = content.replace("  ", " ")  # Remove double spaces
-
-                return content
-
-            cleaned_json_str = clean_json_action(json_str)
+            cleaned_json_str = _clean_json_action(json_str, agent_name)
             width = min(console.width - 2, 120)
 
             # Display in console
@@ -340,7 +323,7 @@ class TTYAnnotator:
             self.st.title(f"🔍 Annotating Instance: {instance_id}")
 
         # Get instance metadata
-        instance = self.dataset.get_instance_metadata(instance_id)
+        instance = self._get_instance_metadata(instance_id)
 
         # Display instance info
         console.print(Markdown("### Instance Metadata"))
@@ -372,14 +355,11 @@ class TTYAnnotator:
                     self.st.markdown(f"- {value}")
 
         # Get selected agent's trajectory
-        trajectory = self.dataset.get_trajectory(instance_id, selected_agent)
-        trajectory_points = [
-            (point, trajectory.get_data_at(idx))
-            for idx, point in enumerate(trajectory.points)
-        ]
+        trajectory = self._get_trajectory(instance_id, selected_agent)
 
-        # Sort by timestamp
-        trajectory_points.sort(key=lambda x: x[0].timestamp)
+        # Visit points by timestamp; point data is loaded lazily so that
+        # skipping an instance does not read the rest of the trajectory from disk
+        point_order = self._get_point_order(instance_id, selected_agent)
 
         # Display trajectory
         console.print(Markdown(f"### Trajectory for Agent: {selected_agent}"))
@@ -387,9 +367,11 @@ class TTYAnnotator:
         console.print("Press Enter to step through observations and actions...")
 
         start_time = None
-        for point, data in trajectory_points:
+        for idx in point_order:
+            point = trajectory.points[idx]
             if start_time is None:
                 start_time = point.timestamp
+            data = trajectory.get_data_at(idx)
 
             # Display timestamp
             console.print(f"\n[cyan]Time:[/cyan] {point.timestamp}")
@@ -453,6 +435,26 @@ class TTYAnnotator:
         console.print("\n[bold green]Annotation saved![/bold green]")
         return True
 
+    def _collect_unannotated_pairs(
+        self, instances: list[str]
+    ) -> tuple[int, list[tuple[str, str]]]:
+        """Count agent trajectories and find the ones not yet annotated"""
+        total_agent_instances = 0
+        unannotated_pairs = []
+        for instance_id in instances:
+            instance = self._get_instance_metadata(instance_id)
+            total_agent_instances += len(instance.agents)
+            for agent_id in instance.agents:
+                trajectory_annotations = (
+                    self.annotation_system.get_trajectory_annotations(
+                        instance_id=instance_id, agent_id=agent_id
+                    )
+                )
+                if not trajectory_annotations.annotations:
+                    unannotated_pairs.append((instance_id, agent_id))
+
+        return total_agent_instances, unannotated_pairs
+
     def run(self) -> None:
         """Run the annotation interface"""
         if self.use_streamlit:
@@ -484,24 +486,18 @@ class TTYAnnotator:
                 console.print("[red]No instances found in dataset![/red]")
                 return
 
-            # Display progress
-            total_agent_instances = sum(
-                len(self.dataset.get_instance_metadata(instance_id).agents)
-                for instance_id in instances
-            )
+            # Progress and unannotated pairs are computed once per session and
+            # updated when an annotation is submitted, not on every rerun
+            if "unannotated_pairs" not in self.st.session_state:
+                total_agent_instances, unannotated_pairs = (
+                    self._collect_unannotated_pairs(instances)
+                )
+                self.st.session_state.total_agent_instances = total_agent_instances
+                self.st.session_state.unannotated_pairs = unannotated_pairs
 
-            # Calculate unannotated pairs
-            unannotated_pairs = []
-            for instance_id in instances:
-                instance = self.dataset.get_instance_metadata(instance_id)
-                for agent_id in instance.agents:
-                    trajectory_annotations = (
-                        self.annotation_system.get_trajectory_annotations(
-                            instance_id=instance_id, agent_id=agent_id
-                        )
-                    )
-                    if not trajectory_annotations.annotations:
-                        unannotated_pairs.append((instance_id, agent_id))
+            # Display progress
+            total_agent_instances = self.st.session_state.total_agent_instances
+            unannotated_pairs = self.st.session_state.unannotated_pairs
 
             annotated_count = total_agent_instances - len(unannotated_pairs)
             self.st.progress(annotated_count / total_agent_instances)
@@ -529,18 +525,15 @@ class TTYAnnotator:
                 self.st.session_state.trajectory_index = 0
 
             # Display current instance
-            instance = self.dataset.get_instance_metadata(
-                self.st.session_state.current_instance
+            trajectory = self._get_trajectory(
+                self.st.session_state.current_instance,
+                self.st.session_state.current_agent,
             )
-            trajectory = self.dataset.get_trajectory(
+            # Visit points by timestamp; only the point on screen has its data loaded
+            point_order = self._get_point_order(
                 self.st.session_state.current_instance,
                 self.st.session_state.current_agent,
             )
-            trajectory_points = [
-                (point, trajectory.get_data_at(idx))
-                for idx, point in enumerate(trajectory.points)
-            ]
-            trajectory_points.sort(key=lambda x: x[0].timestamp)
 
             # Display metadata
             self.st.markdown(f"Instance: **{self.st.session_state.current_instance}**")
@@ -561,8 +554,10 @@ class TTYAnnotator:
                     self.st.rerun()
 
             # Display current trajectory point
-            if self.st.session_state.trajectory_index < len(trajectory_points):
-                point, data = trajectory_points[self.st.session_state.trajectory_index]
+            if self.st.session_state.trajectory_index < len(point_order):
+                idx = point_order[self.st.session_state.trajectory_index]
+                point = trajectory.points[idx]
+                data = trajectory.get_data_at(idx)
 
                 # Add agent name header
                 self.st.markdown(
@@ -598,13 +593,19 @@ class TTYAnnotator:
                         annotator_id=self.annotator_id,
                         content={"feedback": feedback},
                         span=AnnotationSpan(
-                            start_time=trajectory_points[0][0].timestamp,
-                            end_time=trajectory_points[-1][0].timestamp,
+                            start_time=trajectory.points[point_order[0]].timestamp,
+                            end_time=trajectory.points[point_order[-1]].timestamp,
                         ),
                     )
 
                     self.st.success("Annotation saved!")
                     console.print("\n[bold green]Annotation saved![/bold green]")
+                    unannotated_pairs.remove(
+                        (
+                            self.st.session_state.current_instance,
+                            self.st.session_state.current_agent,
+                        )
+                    )
 
                     # Reset for next instance
                     self.st.session_state.current_instance = None
@@ -620,24 +621,10 @@ class TTYAnnotator:
                 return
 
             # Display progress
-            total_agent_instances = sum(
-                len(self.dataset.get_instance_metadata(instance_id).agents)
-                for instance_id in instances
+            total_agent_instances, unannotated_pairs = self._collect_unannotated_pairs(
+                instances
             )
 
-            # Calculate unannotated pairs
-            unannotated_pairs = []
-            for instance_id in instances:
-                instance = self.dataset.get_instance_metadata(instance_id)
-                for agent_id in instance.agents:
-                    trajectory_annotations = (
-                        self.annotation_system.get_trajectory_annotations(
-                            instance_id=instance_id, agent_id=agent_id
-                        )
-                    )
-                    if not trajectory_annotations.annotations:
-                        unannotated_pairs.append((instance_id, agent_id))
-
             annotated_count = total_agent_instances - len(unannotated_pairs)
             console.print(
                 f"\n[cyan]Progress: {annotated_count}/{total_agent_instances} agent trajectories annotated[/cyan]"
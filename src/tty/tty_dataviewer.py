@@ -11,6 +11,8 @@ import json
 from osw_data.dataset import MultiAgentDataset
 from osw_data.trajectory import PointType, MediaType
 
+from tty_utils import format_accessibility_tree
+
 console = Console()
 app = typer.Typer()
 
@@ -111,13 +113,12 @@ class TTYDataviewer:
 
         # Get selected agent's trajectory
         trajectory = self.dataset.get_trajectory(instance_id, selected_agent)
-        trajectory_points = [
-            (point, trajectory.get_data_at(idx))
-            for idx, point in enumerate(trajectory.points)
-        ]
 
-        # Sort by timestamp
-        trajectory_points.sort(key=lambda x: x[0].timestamp)
+        # Sort by timestamp; point data is loaded lazily so that skipping
+        # an instance does not read the rest of the trajectory from disk
+        trajectory_points = sorted(
+            enumerate(trajectory.points), key=lambda x: x[1].timestamp
+        )
 
         # Display trajectory
         console.print(Markdown(f"### Trajectory for Agent: {selected_agent}"))
@@ -125,9 +126,10 @@ class TTYDataviewer:
         console.print("Press Enter to step through observations and actions...")
 
         start_time = None
-        for point, data in trajectory_points:
+        for idx, point in trajectory_points:
             if start_time is None:
                 start_time = point.timestamp
+            data = trajectory.get_data_at(idx)
 
             # Display timestamp
             console.print(f"\n[cyan]Time:[/cyan] {point.timestamp}")
@@ -151,68 +153,6 @@ class TTYDataviewer:
 
         return True
 
-    def _format_accessibility_tree(self, html_text: str) -> str:
-        """Format accessibility tree for better readability"""
-        lines = html_text.strip().split("\\n")
-        formatted_lines = []
-
-        for line in lines:
-            if not line.strip():
-                continue
-
-            # Extract indentation level
-            indent_count = 0
-            for char in line:
-                if char == "\\t":
-                    indent_count += 1
-                else:
-                    break
-
-            # Remove tabs from the start
-            line = line.lstrip("\\t")
-
-            # Parse the line
-            if line.startswith("["):
-                # Extract node ID and content
-                node_id = line[1 : line.index("]")]
-                content = line[line.index("]") + 1 :].strip()
-
-                # Format based on content type
-                if "'" in content:
-                    # Extract the quoted text
-                    text = content[content.index("'") + 1 : content.rindex("'")]
-                    attributes = content[content.rindex("'") + 1 :].strip()
-
-                    # Color coding based on element type
-                    if content.startswith("link"):
-                        element = f"[blue]link[/blue] '{text}'"
-                    elif content.startswith("button"):
-                        element = f"[green]button[/green] '{text}'"
-                    elif content.startswith("textbox"):
-                        element = f"[yellow]textbox[/yellow] '{text}'"
-                    elif content.startswith("heading"):
-                        element = f"[magenta]heading[/magenta] '{text}'"
-                    else:
-                        element = f"{content.split(' ')[0]} '{text}'"
-
-                    # Add attributes if present
-                    if attributes:
-                        element += f" [dim]{attributes}[/dim]"
-
-                    formatted_lines.append(
-                        "  " * indent_count + f"[dim]{node_id}:[/dim] {element}"
-                    )
-                else:
-                    # Lines without quoted text
-                    formatted_lines.append(
-                        "  " * indent_count + f"[dim]{node_id}:[/dim] {content}"
-                    )
-            else:
-                # Tab title or other content
-                formatted_lines.append("  " * indent_count + f"[bold]{line}[/bold]")
-
-        return "\n".join(formatted_lines)
-
     def _display_observation(self, data: Any, media_type: MediaType) -> None:
         """Display an observation based on its media type"""
         if media_type == MediaType.JSON:
@@ -229,7 +169,7 @@ class TTYDataviewer:
                     )
 
                 # Format and display the accessibility tree
-                formatted_html = self._format_accessibility_tree(data["html"])
+                formatted_html = format_accessibility_tree(data["html"])
                 console.print(Panel(formatted_html, title="Page Structure"))
             else:
                 # Pretty print other JSON data
@@ -0,0 +1,65 @@
+import functools
+
+
+# Streamlit reruns the script on every interaction, so the same tree is
+# formatted repeatedly while stepping through a trajectory
+@functools.lru_cache(maxsize=256)
+def format_accessibility_tree(html_text: str) -> str:
+    """Format accessibility tree for better readability"""
+    lines = html_text.strip().split("\\n")
+    formatted_lines = []
+
+    for line in lines:
+        if not line.strip():
+            continue
+
+        # Extract indentation level; tabs are escaped as the two characters "\t"
+        indent_count = 0
+        while line.startswith("\\t", 2 * indent_count):
+            indent_count += 1
+
+        # Remove tabs from the start
+        line = line[2 * indent_count :]
+
+        # Parse the line
+        if line.startswith("[") and "]" in line:
+            node_end = line.index("]")
+            # Extract node ID and content
+            node_id = line[1:node_end]
+            content = line[node_end + 1 :].strip()
+
+            # Format based on content type
+            if "'" in content:
+                # Extract the quoted text
+                text = content[content.index("'") + 1 : content.rindex("'")]
+                attributes = content[content.rindex("'") + 1 :].strip()
+
+                # Color coding based on element type
+                if content.startswith("link"):
+                    element = f"[blue]link[/blue] '{text}'"
+                elif content.startswith("button"):
+                    element = f"[green]button[/green] '{text}'"
+                elif content.startswith("textbox"):
+                    element = f"[yellow]textbox[/yellow] '{text}'"
+                elif content.startswith("heading"):
+                    element = f"[magenta]heading[/magenta] '{text}'"
+                else:
+                    element = f"{content.split(' ')[0]} '{text}'"
+
+                # Add attributes if present
+                if attributes:
+                    element += f" [dim]{attributes}[/dim]"
+
+                formatted_lines.append(
+                    "  " * indent_count + f"[dim]{node_id}:[/dim] {element}"
+                )
+            else:
+                # Lines without quoted text
+                formatted_lines.append(
+                    "  " * indent_count + f"[dim]{node_id}:[/dim] {content}"
+                )
+        else:
+            # Tab title or other content
+            formatted_lines.append("  " * indent_count + f"[bold]{line}[/bold]")
+
+    return "\n".join(formatted_lines)